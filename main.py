@@ -8,9 +8,168 @@ import subprocess
 from pathlib import Path
 from termcolor import colored
 import re
+import sys
+import queue
+import tempfile
+import shutil
+import difflib
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 CONFIG_FILE = os.path.join(SCRIPT_DIR, "ailconfig.json")
+FIX_MEMO_FILE = os.path.join(SCRIPT_DIR, "ailfixmemo.json")
+DEFAULT_BUILD_TARGETS = ["linux/amd64", "linux/arm64", "windows/amd64", "darwin/arm64"]
+DEFAULT_JOB_ANSWERS = {"debug": "y", "cross_compile": "n", "run": "n"}
+PROVIDER_NAMES = {"hf": "HuggingFace", "or": "OpenRouter", "local": "Local (CPU)"}
+
+# Fixed system prompt for the local provider. Every local request starts with
+# it, so llama.cpp evaluates it once and reuses its KV cache afterwards.
+LOCAL_SYSTEM_PROMPT = """You are an expert Golang developer working inside the AI Lang interpreter.
+You turn English descriptions into Go programs, fix Go compilation errors and explain errors and code.
+Follow these rules:
+1. Follow Go best practices and conventions, with proper error handling.
+2. Use only the standard library unless the request says otherwise.
+3. When asked for code, return only complete, compilable Go code without markdown formatting or explanations.
+4. When asked for an explanation, answer in concise plain text without markdown."""
+
+# Standard library packages the local fixer may import when reported as undefined
+STDLIB_IMPORTS = {
+    "bufio": "bufio", "bytes": "bytes", "context": "context", "errors": "errors",
+    "fmt": "fmt", "io": "io", "log": "log", "math": "math", "os": "os",
+    "reflect": "reflect", "regexp": "regexp", "runtime": "runtime", "sort": "sort",
+    "strconv": "strconv", "strings": "strings", "sync": "sync", "time": "time",
+    "unicode": "unicode", "flag": "flag", "slices": "slices", "maps": "maps",
+    "atomic": "sync/atomic", "rand": "math/rand", "big": "math/big", "bits": "math/bits",
+    "filepath": "path/filepath", "json": "encoding/json", "csv": "encoding/csv",
+    "http": "net/http", "exec": "os/exec", "signal": "os/signal", "utf8": "unicode/utf8",
+    "heap": "container/heap", "list": "container/list", "ioutil": "io/ioutil"
+}
+
+# Holds the job owned by the current thread, if any
+job_local = threading.local()
+
+
+class JobCancelled(Exception):
+    """Raised inside a background job once it has been cancelled."""
+
+
+class JobOutput:
+    """Wrapper around stdout that sends output from background jobs to the job's log."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        job = getattr(job_local, "job", None)
+        if job is not None:
+            job["log"].append(text)
+            return len(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class LocalModel:
+    """A GGUF code model running on the CPU through llama.cpp.
+
+    Requests from any thread are queued and served by one worker thread, which
+    keeps the KV cache for LOCAL_SYSTEM_PROMPT warm between requests.
+    """
+
+    def __init__(self, model_path, threads=None, context_size=8192):
+        try:
+            from llama_cpp import Llama
+        except ImportError:
+            raise Exception("The local provider needs llama-cpp-python. Install it with 'pip install llama-cpp-python'.")
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Local model not found: {model_path}")
+
+        self.model_path = model_path
+        self.llm = Llama(model_path=model_path, n_ctx=context_size, n_threads=threads or os.cpu_count(), verbose=False)
+
+        # Evaluate the shared prefix once. llama.cpp reuses the longest matching
+        # token prefix from the previous request, so later requests only pay for
+        # their own part of the prompt.
+        self.llm.create_chat_completion(messages=self.build_messages(""), max_tokens=1)
+
+        self.requests = queue.Queue()
+        self.closed = False
+        self.queue_lock = threading.Lock()
+        self.worker = threading.Thread(target=self.serve, daemon=True)
+        self.worker.start()
+
+    def build_messages(self, prompt):
+        return [
+            {"role": "system", "content": LOCAL_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+
+    def complete(self, prompt, max_tokens=2048, temperature=0.7):
+        """Queue a prompt and block until the worker has answered it."""
+        request = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature,
+                   "done": threading.Event(), "result": None, "error": None}
+        with self.queue_lock:
+            if self.closed:
+                raise Exception("The local model has been unloaded.")
+            self.requests.put(request)
+        request["done"].wait()
+        if request["error"]:
+            raise Exception(f"Local model request failed: {request['error']}")
+        return request["result"]
+
+    def serve(self):
+        """Worker loop: take every queued request and serve them back to back."""
+        while True:
+            batch = [self.requests.get()]
+            while True:
+                try:
+                    batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            # None is the shutdown sentinel from close(); it is always queued last
+            stopping = None in batch
+            batch = [request for request in batch if request is not None]
+
+            # Sorting puts requests with the longest common prefix next to each
+            # other, e.g. repeated debug rounds on the same file
+            batch.sort(key=lambda r: r["prompt"])
+            for request in batch:
+                try:
+                    result = self.llm.create_chat_completion(
+                        messages=self.build_messages(request["prompt"]),
+                        max_tokens=request["max_tokens"],
+                        temperature=request["temperature"],
+                        top_p=0.95
+                    )
+                    request["result"] = result["choices"][0]["message"]["content"]
+                except Exception as e:
+                    request["error"] = str(e)
+                request["done"].set()
+
+            if stopping:
+                return
+
+    def close(self):
+        """Finish queued requests, stop the worker and free the model."""
+        with self.queue_lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.requests.put(None)
+        self.worker.join()
+
+        if hasattr(self.llm, "close"):
+            self.llm.close()
+        self.llm = None
+
 
 class AILanguageInterpreter:
     def __init__(self):
@@ -24,6 +183,26 @@ class AILanguageInterpreter:
             "hf": "Qwen/Qwen2.5-72B-Instruct",
             "or": "google/gemini-2.0-flash-thinking-exp:free"
         })
+        self.model_info.setdefault("local", "")
+        self.local_model = None
+        self.local_model_lock = threading.Lock()
+        self.build_targets = self.config.get("build_targets", list(DEFAULT_BUILD_TARGETS))
+        self.strip_binaries = self.config.get("strip_binaries", False)
+
+        # State of the background build used by interactive sessions
+        self.build_lock = threading.Lock()
+        self.dependency_lock = threading.Lock()
+        self.build_generation = 0
+        self.build_process = None
+        self.build_thread = None
+        self.last_build = None
+        self.fix_memo = self.load_fix_memo()
+
+        # Background jobs started from the REPL with 'make <file> &'
+        self.config_lock = threading.RLock()
+        self.jobs = {}
+        self.next_job_id = 1
+        self.job_executor = None
 
         if not self.provider:
             self.initial_provider_setup()
@@ -35,8 +214,9 @@ class AILanguageInterpreter:
         print("Please select which AI provider you want to use:")
         print("1. HuggingFace")
         print("2. OpenRouter")
+        print("3. Local model on CPU (llama.cpp)")
 
-        choice = input("Enter your choice (1 or 2): ").strip()
+        choice = input("Enter your choice (1, 2 or 3): ").strip()
 
         if choice == "1":
             self.provider = "hf"
@@ -48,6 +228,8 @@ class AILanguageInterpreter:
             if not self.api_keys["or"]:
                 self.api_keys["or"] = input("Please enter your OpenRouter API key: ")
                 self.config["or_api_key"] = self.api_keys["or"]
+        elif choice == "3":
+            self.provider = "local"
         else:
             print(colored("Invalid choice. Defaulting to HuggingFace.", "yellow"))
             self.provider = "hf"
@@ -76,13 +258,18 @@ class AILanguageInterpreter:
             "or_api_key": "",
             "model_info": {
                 "hf": "Qwen/Qwen2.5-72B-Instruct",
-                "or": "google/gemini-2.0-flash-thinking-exp:free"
+                "or": "google/gemini-2.0-flash-thinking-exp:free",
+                "local": ""
             },
+            "local_threads": None,
+            "local_context_size": 8192,
+            "build_targets": list(DEFAULT_BUILD_TARGETS),
+            "strip_binaries": False,
             "project_dirs": []
         }
 
     def save_config(self):
-        with open(CONFIG_FILE, "w") as f:
+        with self.config_lock, open(CONFIG_FILE, "w") as f:
             json.dump(self.config, f, indent=2)
         print(colored("Configuration saved successfully!", "green"))
 
@@ -95,10 +282,18 @@ class AILanguageInterpreter:
             self.api_keys["or"] = input("Please enter your OpenRouter API key: ")
             self.config["or_api_key"] = self.api_keys["or"]
             self.save_config()
+        elif self.provider == "local" and not self.model_info["local"]:
+            self.model_info["local"] = input("Please enter the path to a GGUF model file: ").strip()
+            self.config.setdefault("model_info", self.model_info)["local"] = self.model_info["local"]
+            self.save_config()
 
         if self.provider == "hf":
             self.api_url = f"https://api-inference.huggingface.co/models/{self.model_info['hf']}"
             self.headers = {"Authorization": f"Bearer {self.api_keys['hf']}"}
+        elif self.provider == "local":
+            # The model itself is loaded on first use, see send_to_local
+            self.api_url = None
+            self.headers = {}
         else:
             self.api_url = "https://openrouter.ai/api/v1/chat/completions"
             self.headers = {
@@ -108,8 +303,8 @@ class AILanguageInterpreter:
             }
 
     def change_provider(self, provider):
-        if provider not in ["hf", "or"]:
-            print(colored(f"Invalid provider: {provider}. Use 'hf' for HuggingFace or 'or' for OpenRouter.", "red"))
+        if provider not in PROVIDER_NAMES:
+            print(colored(f"Invalid provider: {provider}. Use 'hf' for HuggingFace, 'or' for OpenRouter or 'local' for a local model.", "red"))
             return False
 
         self.provider = provider
@@ -125,7 +320,7 @@ class AILanguageInterpreter:
         self.setup_api_config()
         self.save_config()
 
-        provider_name = "HuggingFace" if provider == "hf" else "OpenRouter"
+        provider_name = PROVIDER_NAMES[provider]
         model_name = self.model_info[provider]
         print(colored(f"Provider changed to {provider_name}. Using model: {model_name}", "green"))
         return True
@@ -141,6 +336,14 @@ class AILanguageInterpreter:
                 self.save_config()
                 self.setup_api_config()
                 print(colored(f"HuggingFace model changed to: {model_id}", "green"))
+        elif self.provider == "local":
+            print(f"Current local model: {self.model_info['local']}")
+            model_path = input("Please enter the path to a GGUF model file: ").strip()
+            self.model_info["local"] = model_path
+            self.config.setdefault("model_info", self.model_info)["local"] = model_path
+            self.save_config()
+            self.setup_api_config()
+            print(colored(f"Local model changed to: {model_path}", "green"))
         else:
             print(f"Current OpenRouter model: {self.model_info['or']}")
             model_id = input("Please enter the OpenRouter model ID: ").strip()
@@ -186,6 +389,9 @@ Generate only the Golang code without any explanations. The code should be compl
                 else:
                     raise Exception(f"Unexpected response format: {result}")
 
+            elif self.provider == "local":
+                golang_code = self.send_to_local(prompt)
+
             else:
                 payload = {
                     "model": self.model_info["or"],
@@ -223,6 +429,8 @@ Generate only the Golang code without any explanations. The code should be compl
     def debug_golang_code(self, golang_file, error_message):
         """Send the error message and file contents to the AI for debugging
         and update the file with the fixed code.
+
+        Callers run fix_locally first and only pass the errors it couldn't fix.
         """
         print(colored("\nSending code to AI for debugging...", "yellow"))
 
@@ -263,6 +471,9 @@ Generate only the Golang code without any explanations. The code should be compl
                 else:
                     raise Exception(f"Unexpected response format: {result}")
 
+            elif self.provider == "local":
+                fixed_code = self.send_to_local(prompt)
+
             else:
                 payload = {
                     "model": self.model_info["or"],
@@ -288,6 +499,7 @@ Generate only the Golang code without any explanations. The code should be compl
                 f.write(fixed_code)
 
             print(colored(f"Fixed code saved to {golang_file}", "green"))
+            self.remember_fix(golang_file, error_message, file_content, fixed_code)
             return True
 
         except Exception as e:
@@ -295,10 +507,317 @@ Generate only the Golang code without any explanations. The code should be compl
             self.explain_error(str(e))
             return False
 
+    def load_fix_memo(self):
+        if os.path.exists(FIX_MEMO_FILE):
+            try:
+                with open(FIX_MEMO_FILE, "r") as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                print(colored("Error: ailfixmemo.json is corrupted. Starting with an empty fix memo.", "red"))
+        return {}
+
+    def save_fix_memo(self):
+        with self.config_lock, open(FIX_MEMO_FILE, "w") as f:
+            json.dump(self.fix_memo, f, indent=2)
+
+    def quick_build(self, golang_file):
+        """Compile without writing a binary. Returns (success, stderr)."""
+        result = subprocess.run(["go", "build", "-o", os.devnull, os.path.basename(golang_file)],
+                                cwd=os.path.dirname(golang_file), capture_output=True, text=True)
+        return result.returncode == 0, result.stderr
+
+    def parse_build_errors(self, error_message, golang_file):
+        """Parse go build output into a list of errors for golang_file.
+
+        Each error has its line number, message, the identifiers it mentions
+        and a normalized signature with those identifiers and numbers removed.
+        """
+        errors = []
+        for line in error_message.splitlines():
+            match = re.match(r'(?:\./)?(.+?\.go):(\d+):(?:\d+:)? (.+)', line)
+            if match:
+                if os.path.basename(match.group(1)) != os.path.basename(golang_file):
+                    continue
+                errors.append({"line": int(match.group(2)), "message": match.group(3)})
+            elif line.startswith("\t") and errors:
+                # Continuation lines, e.g. "have (...)" / "want (...)"
+                errors[-1]["message"] += "\n" + line.strip()
+
+        for error in errors:
+            message = error["message"]
+            names = re.findall(r'"([^"]+)"', message)
+            name_match = (re.match(r'(\w+) declared (?:and|but) not used', message) or
+                          re.search(r'declared and not used: (\w+)', message) or
+                          re.search(r'undefined: ([\w.]+)', message))
+            if name_match:
+                names.append(name_match.group(1))
+            signature = re.sub(r'"[^"]+"', '"X"', message)
+            for name in names:
+                signature = re.sub(rf'(?<![\w"]){re.escape(name)}(?![\w"])', 'X', signature)
+            error["names"] = names
+            error["signature"] = re.sub(r'\d+', 'N', signature)
+
+        return errors
+
+    def memo_key(self, errors):
+        return "\n".join(sorted({error["signature"] for error in errors}))
+
+    def fix_locally(self, golang_file, error_message):
+        """Try remembered fixes and deterministic fixers, verified with a quick build.
+
+        Returns the errors that are left: an empty string if the code now
+        builds. Partial fixes are kept when they reduce the number of errors.
+        """
+        errors = self.parse_build_errors(error_message, golang_file)
+        if not errors:
+            return error_message
+
+        start = time.perf_counter()
+        with open(golang_file, "r") as f:
+            code = f.read()
+        best_code, best_message = code, error_message
+
+        for _ in range(3):
+            fixed_code = self.apply_fix_memo(code, errors)
+            if fixed_code == code:
+                fixed_code = self.apply_local_fixers(code, errors)
+            if fixed_code == code:
+                break
+
+            with open(golang_file, "w") as f:
+                f.write(fixed_code)
+            success, stderr = self.quick_build(golang_file)
+            if success:
+                print(colored(f"\nFixed locally in {time.perf_counter() - start:.2f} seconds.", "green"))
+                return ""
+
+            # Keep going only while the number of errors goes down
+            new_errors = self.parse_build_errors(stderr, golang_file)
+            if not new_errors or len(new_errors) >= len(errors):
+                break
+            code, errors = fixed_code, new_errors
+            best_code, best_message = fixed_code, stderr
+
+        with open(golang_file, "w") as f:
+            f.write(best_code)
+        if best_message != error_message:
+            print(colored(f"Fixed some errors locally; {len(errors)} left.", "cyan"))
+        return best_message
+
+    def memo_errors(self, errors):
+        """Errors in the order used for memo placeholders and hunk anchors."""
+        return sorted(errors, key=lambda e: (e["signature"], e["line"]))
+
+    def memo_placeholder(self, index):
+        # NUL can't appear in Go source, so placeholders never clash with code
+        return f"\x00{index}\x00"
+
+    def apply_fix_memo(self, code, errors):
+        """Apply a remembered patch for this exact set of error signatures.
+
+        Each hunk must match within a few lines of the position it had relative
+        to its error when it was recorded, otherwise the memo isn't used.
+        """
+        entry = self.fix_memo.get(self.memo_key(errors))
+        if not entry or "hunks" not in entry:
+            return code
+
+        ordered = self.memo_errors(errors)
+        names = [name for error in ordered for name in error["names"]]
+        if len(names) != entry["name_count"] or len(ordered) != entry["error_count"]:
+            return code
+
+        lines = code.splitlines(keepends=True)
+        hunks = []
+        for hunk in entry["hunks"]:
+            old, new = hunk["old"], hunk["new"]
+            for index, name in enumerate(names):
+                old = old.replace(self.memo_placeholder(index), name)
+                new = new.replace(self.memo_placeholder(index), name)
+            old_lines = old.splitlines(keepends=True)
+            expected = ordered[hunk["error"]]["line"] - 1 + hunk["offset"]
+
+            window = range(max(expected - 2, 0), min(expected + 2, len(lines) - len(old_lines)) + 1)
+            matches = [start for start in window if lines[start:start + len(old_lines)] == old_lines]
+            if not matches:
+                return code
+            start = min(matches, key=lambda m: abs(m - expected))
+            hunks.append((start, len(old_lines), new.splitlines(keepends=True)))
+
+        # Apply bottom-up so earlier positions stay valid
+        for start, length, new_lines in sorted(hunks, key=lambda h: h[0], reverse=True):
+            lines[start:start + length] = new_lines
+
+        print(colored("Applying a remembered fix...", "cyan"))
+        return "".join(lines)
+
+    def remember_fix(self, golang_file, error_message, old_code, new_code):
+        """Record the AI's fix for these errors if it builds and is small enough to reuse."""
+        errors = self.parse_build_errors(error_message, golang_file)
+        if not errors or not self.quick_build(golang_file)[0]:
+            return
+
+        ordered = self.memo_errors(errors)
+        names = [name for error in ordered for name in error["names"]]
+        old_lines = old_code.splitlines(keepends=True)
+        new_lines = new_code.splitlines(keepends=True)
+        hunks = []
+        changed = 0
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            # Anchor inserts on the line before so the patch has something to match
+            anchor = max(i1 - 1, 0) if i1 == i2 else i1
+            old = "".join(old_lines[anchor:i2])
+            new = "".join(old_lines[anchor:i1]) + "".join(new_lines[j1:j2])
+            if not old:
+                return
+
+            # Tie the hunk to the closest error so it is only applied near it
+            error_index = min(range(len(ordered)), key=lambda k: abs(ordered[k]["line"] - 1 - anchor))
+            offset = anchor - (ordered[error_index]["line"] - 1)
+            if abs(offset) > 5:
+                return
+
+            for index, name in enumerate(names):
+                old = re.sub(rf'\b{re.escape(name)}\b', self.memo_placeholder(index), old)
+                new = re.sub(rf'\b{re.escape(name)}\b', self.memo_placeholder(index), new)
+            hunks.append({"old": old, "new": new, "error": error_index, "offset": offset})
+            changed += max(i2 - i1, j2 - j1)
+
+        if not hunks or changed > 20:
+            return
 
-    def infer_and_install_dependencies(self, golang_file, project_dir):
-        """Infer dependencies from the Go code and install them."""
+        # Concurrent jobs may be saving the memo; don't change it mid-dump
+        with self.config_lock:
+            self.fix_memo[self.memo_key(errors)] = {"hunks": hunks, "name_count": len(names), "error_count": len(ordered)}
+            self.save_fix_memo()
+
+    def apply_local_fixers(self, code, errors):
+        """Deterministic fixes for the most common compiler errors."""
+        lines = code.splitlines(keepends=True)
+        missing_imports = set()
+
+        # Work bottom-up so earlier line numbers stay valid
+        for error in sorted(errors, key=lambda e: e["line"], reverse=True):
+            message = error["message"]
+            index = error["line"] - 1
+            if index >= len(lines):
+                continue
+            line = lines[index]
+
+            unused_import = re.match(r'"([^"]+)" imported (?:as \w+ )?and not used', message)
+            unused_variable = (re.match(r'(\w+) declared (?:and|but) not used', message) or
+                               re.match(r'declared and not used: (\w+)', message))
+            undefined = re.match(r'undefined: (\w+)$', message)
+            missing_results = re.match(r'not enough return values\nhave \((.*)\)\nwant \((.*)\)$', message)
+
+            if unused_import and f'"{unused_import.group(1)}"' in line:
+                del lines[index]
+            elif unused_variable:
+                # Mark the variable as used rather than deleting a line that may have side effects
+                stripped = line.rstrip()
+                if stripped.endswith(("(", ",", "[")):
+                    continue
+                indent = re.match(r'\s*', line).group(0)
+                if stripped.endswith("{"):
+                    indent += "\t"
+                lines.insert(index + 1, f"{indent}_ = {unused_variable.group(1)}\n")
+            elif undefined and undefined.group(1) in STDLIB_IMPORTS:
+                missing_imports.add(STDLIB_IMPORTS[undefined.group(1)])
+            elif missing_results:
+                fixed_line = self.complete_return(line, missing_results.group(1), missing_results.group(2))
+                if fixed_line:
+                    lines[index] = fixed_line
+
+        code = "".join(lines)
+        if missing_imports:
+            code = self.add_imports(code, missing_imports)
+
+        # goimports handles imports outside STDLIB_IMPORTS; gofmt keeps the import block sorted
+        if shutil.which("goimports") and any("import" in e["message"] or "undefined:" in e["message"] for e in errors):
+            formatter = "goimports"
+        else:
+            formatter = "gofmt"
+        if shutil.which(formatter):
+            result = subprocess.run([formatter], input=code, capture_output=True, text=True)
+            if result.returncode == 0:
+                code = result.stdout
+        return code
+
+    def split_type_list(self, types):
+        """Split a comma-separated Go type list, ignoring commas inside brackets."""
+        parts = []
+        depth = 0
+        current = ""
+        for char in types:
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+            if char == "," and depth == 0:
+                parts.append(current.strip())
+                current = ""
+            else:
+                current += char
+        if current.strip():
+            parts.append(current.strip())
+        return parts
+
+    def zero_value(self, go_type):
+        """The zero value literal for a Go type, or None if it can't be known from the name alone."""
+        if go_type in ("error", "any") or go_type.startswith(("*", "[]", "map[", "chan ", "<-chan", "func", "interface")):
+            return "nil"
+        if re.fullmatch(r'u?int(8|16|32|64)?|uintptr|byte|rune|float(32|64)|complex(64|128)', go_type):
+            return "0"
+        if go_type == "string":
+            return '""'
+        if go_type == "bool":
+            return "false"
+        if re.match(r'\[\d+\]', go_type):
+            return go_type + "{}"
+        # A named type could be a struct, an interface or a number
+        return None
+
+    def complete_return(self, line, have, want):
+        """Append zero values for the results missing from a return statement."""
+        match = re.match(r'(\s*return\b)(.*?)(\s*(?://.*)?)$', line.rstrip("\n"))
+        if not match:
+            return None
+
+        have_count = len(self.split_type_list(have))
+        wanted = self.split_type_list(want)
+        zeros = [self.zero_value(go_type) for go_type in wanted[have_count:]]
+        if not zeros or None in zeros:
+            return None
+
+        values = match.group(2).strip()
+        if values.count("(") != values.count(")"):
+            return None  # The return statement continues on the next line
+        values = ", ".join(([values] if values else []) + zeros)
+        return f"{match.group(1)} {values}{match.group(3)}\n"
+
+    def add_imports(self, code, paths):
+        """Add standard library imports to Go source."""
+        new_imports = "".join(f'\t"{path}"\n' for path in sorted(paths))
+        if re.search(r'^import \($', code, re.MULTILINE):
+            return re.sub(r'^import \(\n', lambda m: m.group(0) + new_imports, code, count=1, flags=re.MULTILINE)
+        single = re.search(r'^import (\w+ )?"[^"]+"\n', code, re.MULTILINE)
+        if single:
+            existing = "\t" + single.group(0)[len("import "):]
+            return code.replace(single.group(0), "import (\n" + existing + new_imports + ")\n", 1)
+        return re.sub(r'^package \w+\n', lambda m: m.group(0) + "\nimport (\n" + new_imports + ")\n", code, count=1, flags=re.MULTILINE)
+
+    def infer_and_install_dependencies(self, golang_file, project_dir, explain=True):
+        """Infer dependencies from the Go code and install them.
+
+        Returns the error output of any failed installs. Background builds pass
+        explain=False so failures are reported with the build result instead
+        of asking the AI from the worker thread.
+        """
         print(colored("\nInferring and installing dependencies...", "yellow"))
+        failures = []
         try:
             with open(golang_file, 'r') as f:
                 code = f.read()
@@ -318,7 +837,7 @@ Generate only the Golang code without any explanations. The code should be compl
 
             if not filtered_dependencies:
                 print(colored("No external dependencies found.", "green"))
-                return
+                return failures
 
             print(colored(f"Found dependencies: {', '.join(filtered_dependencies)}", "cyan"))
 
@@ -328,18 +847,24 @@ Generate only the Golang code without any explanations. The code should be compl
                 result = subprocess.run(["go", "get", dep], cwd=project_dir, capture_output=True, text=True)
                 if result.returncode != 0:
                     print(colored(f"Failed to install {dep}: {result.stderr}", "red"))
-                    self.explain_error(result.stderr) # Explain dependency install error
+                    failures.append(f"go get {dep}: {result.stderr}")
+                    if explain:
+                        self.explain_error(result.stderr) # Explain dependency install error
                 else:
                     print(colored(f"Successfully installed {dep}", "green"))
 
+            return failures
+
         except FileNotFoundError:
             error_msg = f"Error: Go file not found: {golang_file}"
             print(colored(error_msg, "red"))
-            self.explain_error(error_msg)
+            if explain:
+                self.explain_error(error_msg)
             raise
         except Exception as e:
             print(colored(f"Error inferring/installing dependencies: {str(e)}", "red"))
-            self.explain_error(str(e))
+            if explain:
+                self.explain_error(str(e))
             raise
 
     def build_program(self, golang_file, project_dir):
@@ -349,6 +874,98 @@ Generate only the Golang code without any explanations. The code should be compl
         time.sleep(min(estimated_time, 3))  # Simulate build time
         return True
 
+    def set_build_targets(self, targets):
+        """Set the GOOS/GOARCH targets used by the cross-compilation stage."""
+        parsed = []
+        for target in targets.replace(",", " ").split():
+            if not re.fullmatch(r"[a-z0-9]+/[a-z0-9]+", target):
+                print(colored(f"Invalid target: {target}. Use the form goos/goarch, e.g. linux/amd64.", "red"))
+                return False
+            parsed.append(target)
+
+        if not parsed:
+            print(colored("No targets given.", "red"))
+            return False
+
+        # Duplicates would run concurrent builds writing the same output file
+        parsed = list(dict.fromkeys(parsed))
+        self.build_targets = parsed
+        self.config["build_targets"] = parsed
+        self.save_config()
+        print(colored(f"Build targets set to: {', '.join(parsed)}", "green"))
+        return True
+
+    def set_strip_binaries(self, enabled):
+        """Toggle -trimpath -ldflags='-s -w' for cross-compiled binaries."""
+        self.strip_binaries = enabled
+        self.config["strip_binaries"] = enabled
+        self.save_config()
+        print(colored(f"Binary stripping {'enabled' if enabled else 'disabled'}.", "green"))
+
+    def build_target(self, golang_file, project_dir, target, env):
+        """Build the program for a single GOOS/GOARCH target."""
+        goos, goarch = target.split("/")
+        project_name = os.path.basename(os.path.normpath(project_dir))
+        exe_name = f"{project_name}-{goos}-{goarch}" + (".exe" if goos == "windows" else "")
+        output_path = os.path.join(project_dir, "dist", exe_name)
+
+        command = ["go", "build", "-o", output_path]
+        if self.strip_binaries:
+            command += ["-trimpath", "-ldflags=-s -w"]
+        command.append(os.path.basename(golang_file))
+
+        target_env = dict(env, GOOS=goos, GOARCH=goarch, CGO_ENABLED="0")
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=project_dir, env=target_env, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+
+        size = os.path.getsize(output_path) if result.returncode == 0 and os.path.exists(output_path) else None
+        return {
+            "target": target,
+            "path": output_path,
+            "success": result.returncode == 0,
+            "seconds": elapsed,
+            "size": size,
+            "stderr": result.stderr
+        }
+
+    def cross_compile(self, golang_file, project_dir):
+        """Build the program for every configured target concurrently."""
+        if not self.build_targets:
+            print(colored("No build targets configured. Use 'targets <goos/goarch,...>' to set them.", "yellow"))
+            return []
+
+        print(colored(f"\nCross-compiling for {len(self.build_targets)} targets: {', '.join(self.build_targets)}", "yellow"))
+        os.makedirs(os.path.join(project_dir, "dist"), exist_ok=True)
+
+        # All targets share one build cache so the standard library and common
+        # dependencies are only compiled once per architecture.
+        env = os.environ.copy()
+        if not env.get("GOCACHE"):
+            cache = subprocess.run(["go", "env", "GOCACHE"], capture_output=True, text=True)
+            if cache.returncode == 0 and cache.stdout.strip():
+                env["GOCACHE"] = cache.stdout.strip()
+
+        results = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(self.build_targets)) as executor:
+            futures = [executor.submit(self.build_target, golang_file, project_dir, target, env) for target in self.build_targets]
+            for future in as_completed(futures):
+                results.append(future.result())
+        total = time.perf_counter() - start
+
+        results.sort(key=lambda r: self.build_targets.index(r["target"]))
+        for r in results:
+            if r["success"]:
+                print(colored(f"  {r['target']:<16} {r['seconds']:6.1f}s  {r['size'] / (1024 * 1024):6.2f} MB  {r['path']}", "green"))
+            else:
+                print(colored(f"  {r['target']:<16} {r['seconds']:6.1f}s  FAILED", "red"))
+                print(colored(r["stderr"], "red"))
+
+        built = sum(1 for r in results if r["success"])
+        print(colored(f"Built {built}/{len(results)} targets in {total:.1f} seconds.", "green" if built == len(results) else "yellow"))
+        return results
+
 
     def show_interactive_commands(self):
         """Display the list of available interactive commands."""
@@ -359,6 +976,7 @@ modify   - Make specific changes to the code
 explain  - Explain the current code
 optimize - Optimize the current code
 add      - Add new functionality
+debug    - Debug and fix errors from the last build
 done     - Exit interactive mode
         """)
 
@@ -380,22 +998,16 @@ done     - Exit interactive mode
 
             project_name = input("\nEnter the name for your project: ").strip()
             project_dir = os.path.join(os.getcwd(), project_name)
+            self.claim_project_dir(project_dir)
             os.makedirs(project_dir, exist_ok=True)
 
-            # Add project directory to config
-            if "project_dirs" not in self.config:
-                self.config["project_dirs"] = []
-            if project_dir not in self.config["project_dirs"]:
-                self.config["project_dirs"].append(project_dir)
-                self.save_config()
-
 
             print("\nConverting English to Golang...")
             golang_file = self.convert_to_golang(english_text, project_dir)
 
-            # Create go.mod and install dependencies
+            # Create go.mod, then install dependencies and build in the background
             subprocess.run(["go", "mod", "init", project_name], cwd=project_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.infer_and_install_dependencies(golang_file, project_dir)
+            self.start_background_build(golang_file, project_dir)
 
             self.show_interactive_commands()
 
@@ -415,17 +1027,21 @@ done     - Exit interactive mode
                     self.handle_interactive_command(command, golang_file)
                 elif command in ['modify', 'optimize', 'add']:
                     self.handle_interactive_command(command, golang_file)
-                    # Attempt to build after modification
-                    result = subprocess.run(["go", "build", golang_file], cwd=project_dir, capture_output=True, text=True)
-                    if result.returncode != 0:
-                        print(colored("Build failed!", "red"))
-                        print(colored(result.stderr, "red"))
-                        self.explain_error(result.stderr) # Explain build error
-                        debug_choice = input("\nWould you like to debug and fix the errors? (y/n): ").strip().lower()
-                        if debug_choice == 'y':
-                            self.debug_golang_code(golang_file, result.stderr)
-                    # Re-install dependencies after modification
-                    self.infer_and_install_dependencies(golang_file, project_dir)
+                    # Rebuild in the background so the prompt stays responsive
+                    self.start_background_build(golang_file, project_dir)
+                elif command == 'debug':
+                    self.wait_for_background_build()
+                    if self.last_build is None:
+                        print(colored("No build has finished yet. Make a change to start one.", "yellow"))
+                        continue
+                    if self.last_build["success"]:
+                        print(colored("The last build succeeded. Nothing to debug.", "green"))
+                        continue
+                    error_message = self.fix_locally(golang_file, self.last_build["stderr"])
+                    if error_message:
+                        self.explain_error(error_message) # Explain build error
+                    if not error_message or self.debug_golang_code(golang_file, error_message):
+                        self.start_background_build(golang_file, project_dir)
 
                 else:
                     print(colored("Unknown command. Type 'help' to see available commands.", "red"))
@@ -435,10 +1051,92 @@ done     - Exit interactive mode
             self.explain_error(str(e))
 
 
+    def start_background_build(self, golang_file, project_dir):
+        """Check dependencies and build in a worker thread, cancelling any stale build."""
+        with self.build_lock:
+            self.build_generation += 1
+            generation = self.build_generation
+            if self.build_process and self.build_process.poll() is None:
+                self.build_process.kill()
+
+        self.build_thread = threading.Thread(
+            target=self.background_build,
+            args=(golang_file, project_dir, generation),
+            daemon=True
+        )
+        self.build_thread.start()
+
+    def background_build(self, golang_file, project_dir, generation):
+        """Worker thread body for start_background_build."""
+        try:
+            with open(golang_file, 'r') as f:
+                code_hash = hashlib.sha256(f.read().encode()).hexdigest()
+
+            # go get edits go.mod/go.sum, so only one build installs dependencies
+            # at a time, and a superseded build skips the step entirely
+            with self.dependency_lock:
+                if generation != self.build_generation:
+                    return
+                dependency_errors = self.infer_and_install_dependencies(golang_file, project_dir, explain=False)
+
+            with self.build_lock:
+                if generation != self.build_generation:
+                    return
+                process = subprocess.Popen(["go", "build", golang_file], cwd=project_dir,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                self.build_process = process
+
+            _, stderr = process.communicate()
+            if process.returncode != 0 and dependency_errors:
+                # Failed installs usually explain the build failure, so 'debug' sees both
+                stderr = "".join(dependency_errors) + stderr
+
+            with self.build_lock:
+                # A newer edit landed while we were building; its build reports instead
+                if generation != self.build_generation:
+                    return
+                self.last_build = {"hash": code_hash, "success": process.returncode == 0, "stderr": stderr}
+
+            if process.returncode == 0:
+                print(colored("\nBackground build succeeded.", "green"))
+            else:
+                print(colored("\nBackground build failed!", "red"))
+                print(colored(stderr, "red"))
+                print(colored("Type 'debug' to explain and fix the errors.", "yellow"))
+
+        except Exception as e:
+            with self.build_lock:
+                if generation != self.build_generation:
+                    return
+                self.last_build = {"hash": None, "success": False, "stderr": str(e)}
+            print(colored(f"\nBackground build error: {e}", "red"))
+            print(colored("Type 'debug' to explain and fix the errors.", "yellow"))
+
+    def wait_for_background_build(self):
+        """Block until the most recent background build has finished."""
+        if self.build_thread and self.build_thread.is_alive():
+            print(colored("Waiting for the background build to finish...", "yellow"))
+            self.build_thread.join()
+
+    def reuse_last_build(self, golang_file, project_dir):
+        """Return True if the last background build succeeded on the current code."""
+        self.wait_for_background_build()
+        if not self.last_build or not self.last_build["success"]:
+            return False
+
+        with open(golang_file, 'r') as f:
+            code_hash = hashlib.sha256(f.read().encode()).hexdigest()
+        exe_file = golang_file.removesuffix('.go')
+        if code_hash != self.last_build["hash"] or not os.path.exists(os.path.join(project_dir, exe_file)):
+            return False
+
+        print(colored("Reusing the last successful build.", "green"))
+        return True
+
     def build_and_debug_on_exit(self, golang_file, project_dir):
         """Build the program and offer debugging options on exit from interactive mode."""
 
-        build_success = False
+        build_success = self.reuse_last_build(golang_file, project_dir)
         debug_attempts = 0
         max_debug_attempts = 5
 
@@ -448,7 +1146,13 @@ done     - Exit interactive mode
             if result.returncode != 0:
                 print(colored("Build failed!", "red"))
                 print(colored(result.stderr, "red"))
-                self.explain_error(result.stderr) # Explain build error
+
+                # Only errors the local fixers can't handle need the AI
+                error_message = self.fix_locally(golang_file, result.stderr)
+                if not error_message:
+                    print(colored("\nAttempting to build with fixed code...", "yellow"))
+                    continue
+                self.explain_error(error_message) # Explain build error
 
                 debug_choice = input("\nWould you like to debug and fix the errors? (y/n): ").strip().lower()
 
@@ -456,7 +1160,7 @@ done     - Exit interactive mode
                     debug_attempts += 1
                     print(colored(f"Debug attempt {debug_attempts}/{max_debug_attempts}", "yellow"))
 
-                    debug_success = self.debug_golang_code(golang_file, result.stderr)
+                    debug_success = self.debug_golang_code(golang_file, error_message)
 
                     if not debug_success:
                         print(colored("Failed to debug the code. Please try again.", "red"))
@@ -473,6 +1177,10 @@ done     - Exit interactive mode
             exe_file = golang_file.removesuffix('.go')
             print(colored(f"\nSuccess! Built your program at '{os.path.join(project_dir, exe_file)}'.", "green"))
 
+            cross_choice = input(f"Do you want to cross-compile for {', '.join(self.build_targets)}? (y/n): ").strip().lower()
+            if cross_choice == 'y':
+                self.cross_compile(golang_file, project_dir)
+
             run_program = input("Do you want to run the program? (y/n): ").strip().lower()
             if run_program == 'y':
                 subprocess.run([os.path.join(project_dir, exe_file)], cwd=project_dir)
@@ -495,16 +1203,31 @@ done     - Exit interactive mode
                 prompt = f"Explain this Golang code:\n{current_code}"
             else:
                 user_input = input(colored("Describe your task: ", "cyan"))
-                prompt_map = {
-                    'modify': f"Modify this Golang code according to the following request: '{user_input}'. Return only the complete modified code:\n{current_code}",
-                    'optimize': f"Optimize this Golang code, focusing on: {user_input}. Return only the optimized code:\n{current_code}",
-                    'add': f"Add the following functionality to this Golang code: '{user_input}'. Return only the complete modified code:\n{current_code}"
-                }
+                context = self.slice_context(current_code, user_input)
+
+                if context is None:
+                    prompt_map = {
+                        'modify': f"Modify this Golang code according to the following request: '{user_input}'. Return only the complete modified code:\n{current_code}",
+                        'optimize': f"Optimize this Golang code, focusing on: {user_input}. Return only the optimized code:\n{current_code}",
+                        'add': f"Add the following functionality to this Golang code: '{user_input}'. Return only the complete modified code:\n{current_code}"
+                    }
+                else:
+                    outline, relevant_code = context
+                    instructions = ("Only the declarations relevant to the request are shown in full; the outline lists the rest of the file. "
+                                    "Return only the complete declarations you changed or added, plus an import block with any imports you added. "
+                                    "Do not return unchanged declarations.")
+                    prompt_map = {
+                        'modify': f"Modify this Golang code according to the following request: '{user_input}'. {instructions}\n\nFILE OUTLINE:\n{outline}\n\nRELEVANT CODE:\n{relevant_code}",
+                        'optimize': f"Optimize this Golang code, focusing on: {user_input}. {instructions}\n\nFILE OUTLINE:\n{outline}\n\nRELEVANT CODE:\n{relevant_code}",
+                        'add': f"Add the following functionality to this Golang code: '{user_input}'. {instructions}\n\nFILE OUTLINE:\n{outline}\n\nRELEVANT CODE:\n{relevant_code}"
+                    }
                 prompt = prompt_map[command]
 
 
             if self.provider == "hf":
                 response = self.send_to_hf(prompt)
+            elif self.provider == "local":
+                response = self.send_to_local(prompt)
             else:
                 response = self.send_to_or(prompt)
 
@@ -512,6 +1235,8 @@ done     - Exit interactive mode
                 print("\nExplanation:")
                 print(colored(response, "yellow"))
             else:
+                if context is not None:
+                    response = self.merge_declarations(current_code, response)
                 with open(golang_file, 'w') as f:
                     f.write(response)
                 print(colored("\nCode updated successfully!", "green"))
@@ -521,6 +1246,197 @@ done     - Exit interactive mode
             self.explain_error(str(e))
 
 
+    def split_go_declarations(self, code):
+        """Split Go source into its top-level declarations.
+
+        Returns a list of dicts with the declaration kind, the names it
+        declares and its text, including any doc comment directly above it.
+        Brackets inside strings, runes and comments are ignored.
+        """
+        lines = code.splitlines(keepends=True)
+        starts = []
+        depth = 0
+        in_block_comment = False
+        in_raw_string = False
+
+        for index, line in enumerate(lines):
+            if depth == 0 and not in_block_comment and not in_raw_string and \
+                    re.match(r'(package|import|func|type|var|const)\b', line):
+                starts.append(index)
+
+            i = 0
+            while i < len(line):
+                char = line[i]
+                if in_block_comment:
+                    if line.startswith("*/", i):
+                        in_block_comment = False
+                        i += 1
+                elif in_raw_string:
+                    if char == "`":
+                        in_raw_string = False
+                elif line.startswith("//", i):
+                    break
+                elif line.startswith("/*", i):
+                    in_block_comment = True
+                    i += 1
+                elif char == "`":
+                    in_raw_string = True
+                elif char in "\"'":
+                    i += 1
+                    while i < len(line) and line[i] != char:
+                        i += 2 if line[i] == "\\" else 1
+                elif char in "{([":
+                    depth += 1
+                elif char in "})]":
+                    depth = max(depth - 1, 0)
+                i += 1
+
+        # Doc comments directly above a declaration belong to it
+        boundaries = []
+        for n, start in enumerate(starts):
+            floor = starts[n - 1] + 1 if n > 0 else 0
+            while start > floor and lines[start - 1].lstrip().startswith("//"):
+                start -= 1
+            boundaries.append(start)
+
+        declarations = []
+        if boundaries and boundaries[0] > 0:
+            declarations.append({"kind": "comment", "names": [], "text": "".join(lines[:boundaries[0]])})
+
+        for n, start in enumerate(boundaries):
+            end = boundaries[n + 1] if n + 1 < len(boundaries) else len(lines)
+            text = "".join(lines[start:end])
+            header = lines[starts[n]]
+            kind = header.split()[0].rstrip("(")
+            names = []
+
+            if kind == "func":
+                match = re.match(r'func\s*(?:\(\s*(?:\w+\s+)?\*?\s*(\w+)[^)]*\)\s*)?(\w+)', header)
+                if match:
+                    names.append(f"{match.group(1)}.{match.group(2)}" if match.group(1) else match.group(2))
+            elif kind in ("type", "var", "const"):
+                if re.match(rf'{kind}\s*\(', header):
+                    names = re.findall(r'^\s+(\w+)', "".join(lines[starts[n] + 1:end]), re.MULTILINE)
+                else:
+                    names = re.findall(rf'{kind}\s+(\w+)', header)[:1]
+
+            declarations.append({"kind": kind, "names": names, "text": text})
+
+        return declarations
+
+    def declaration_signature(self, declaration):
+        """Return a one-line outline entry for a declaration."""
+        first_line = next((line for line in declaration["text"].splitlines()
+                           if line.strip() and not line.lstrip().startswith("//")), "")
+        if first_line.rstrip().endswith("{"):
+            return first_line.rstrip()[:-1].rstrip() + " { ... }"
+        if first_line.rstrip().endswith("("):
+            return first_line.rstrip() + " " + ", ".join(declaration["names"]) + " )"
+        return first_line.rstrip()
+
+    def slice_context(self, code, request):
+        """Pick the declarations relevant to a request and their call-graph neighbours.
+
+        Returns (outline, relevant_code), or None when the file is small or the
+        request can't be narrowed down, in which case the whole file is sent.
+        """
+        min_lines = self.config.get("context_slice_min_lines", 120)
+        if len(code.splitlines()) < min_lines:
+            return None
+
+        declarations = self.split_go_declarations(code)
+        named = [d for d in declarations if d["names"]]
+        if not named:
+            return None
+
+        # Match words in the request against declaration names, including the
+        # parts of camelCase and receiver-qualified names
+        words = {w.lower() for w in re.findall(r'[A-Za-z_]\w{2,}', request)}
+        def name_parts(name):
+            parts = {name.lower()}
+            for piece in name.split("."):
+                parts.add(piece.lower())
+                parts.update(p.lower() for p in re.findall(r'[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])', piece))
+            return parts
+
+        seeds = [d for d in named if any(words & name_parts(name) for name in d["names"])]
+        if not seeds:
+            return None
+
+        def references(declaration, name):
+            return re.search(rf'\b{re.escape(name.split(".")[-1])}\b', declaration["text"]) is not None
+
+        # One hop through the call graph in both directions: what the seeds
+        # use, and what uses the seeds
+        selected = list(seeds)
+        for declaration in named:
+            if declaration in selected:
+                continue
+            if any(references(seed, name) for seed in seeds for name in declaration["names"]) or \
+                    any(references(declaration, name) for seed in seeds for name in seed["names"]):
+                selected.append(declaration)
+
+        relevant_code = "".join(d["text"] for d in declarations if d in selected)
+        if len(relevant_code) > 0.7 * len(code):
+            return None
+
+        outline = []
+        for declaration in declarations:
+            if declaration["kind"] in ("package", "import"):
+                outline.append(declaration["text"].strip())
+            elif declaration["names"] and declaration not in selected:
+                outline.append(self.declaration_signature(declaration))
+
+        print(colored(f"Sending {len(selected)} of {len(named)} declarations to the model.", "cyan"))
+        return "\n".join(outline), relevant_code
+
+    def merge_declarations(self, code, new_code):
+        """Merge declarations returned by the model back into the full file."""
+        declarations = self.split_go_declarations(code)
+        returned = self.split_go_declarations(new_code)
+
+        # The model only saw a slice of the file, so it can't know which imports
+        # the hidden declarations use. Its imports only replace the file's when
+        # it returned the complete file; otherwise they are added, and imports
+        # that end up unused are removed by the local fixers on the next build.
+        original_names = {name for d in declarations for name in d["names"]}
+        returned_names = {name for d in returned for name in d["names"]}
+        complete_file = any(d["kind"] == "package" for d in returned) and original_names <= returned_names
+        import_source = returned if complete_file else declarations + returned
+        imports = set()
+        for declaration in import_source:
+            if declaration["kind"] == "import":
+                body = declaration["text"].split("import", 1)[1]
+                imports.update(line.strip() for line in body.strip().strip("()").splitlines()
+                               if line.strip() and not line.strip().startswith("//"))
+
+        for declaration in returned:
+            if declaration["kind"] not in ("func", "type", "var", "const"):
+                continue
+            text = declaration["text"].rstrip("\n") + "\n\n"
+            for index, existing in enumerate(declarations):
+                if existing["kind"] == declaration["kind"] and set(existing["names"]) & set(declaration["names"]):
+                    declarations[index] = dict(declaration, text=text)
+                    break
+            else:
+                declarations.append(dict(declaration, text=text))
+
+        merged = []
+        import_written = False
+        for declaration in declarations:
+            if declaration["kind"] == "import":
+                if not import_written and imports:
+                    merged.append("import (\n" + "".join(f"\t{imp}\n" for imp in sorted(imports)) + ")\n\n")
+                import_written = True
+                continue
+            merged.append(declaration["text"])
+
+        if not import_written and imports:
+            package_index = next((i for i, d in enumerate(declarations) if d["kind"] == "package"), -1)
+            merged.insert(package_index + 1, "import (\n" + "".join(f"\t{imp}\n" for imp in sorted(imports)) + ")\n\n")
+
+        return "".join(merged).rstrip("\n") + "\n"
+
     def send_to_hf(self, prompt):
         """Send prompt to HuggingFace and process response."""
         payload = {
@@ -563,6 +1479,115 @@ done     - Exit interactive mode
         result = response.json()
         return result["choices"][0]["message"]["content"].replace("```go", "").replace("```golang", "").replace("```", "").strip()
 
+    def load_local_model(self):
+        """Return the local model, loading it (and warming its prompt prefix) if needed."""
+        with self.local_model_lock:
+            if self.local_model is None or self.local_model.model_path != self.model_info["local"]:
+                # Free the previous model first; two GGUF models may not fit in RAM
+                if self.local_model is not None:
+                    self.local_model.close()
+                    self.local_model = None
+                print(colored(f"Loading local model {self.model_info['local']}...", "yellow"))
+                self.local_model = LocalModel(
+                    self.model_info["local"],
+                    threads=self.config.get("local_threads"),
+                    context_size=self.config.get("local_context_size", 8192)
+                )
+            return self.local_model
+
+    def send_to_local(self, prompt):
+        """Send prompt to the local model and process response."""
+        response = self.load_local_model().complete(prompt)
+        return response.replace("```go", "").replace("```golang", "").replace("```", "").strip()
+
+    def provider_available(self, provider):
+        """Whether a provider is configured well enough to be used without prompting."""
+        if provider == "local":
+            return bool(self.model_info.get("local")) and os.path.exists(self.model_info["local"])
+        return bool(self.api_keys[provider])
+
+    def benchmark_providers(self, file_path, providers=None):
+        """Generate the same .ail file with each provider and compare latency and results."""
+        if not file_path.endswith('.ail'):
+            raise ValueError("Only .ail files are supported")
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        # The benchmark switches the shared provider settings, which would leak
+        # into any job or background build still sending requests
+        active_jobs = [job["id"] for job in self.jobs.values() if job["status"] in ("queued", "running")]
+        if active_jobs or (self.build_thread and self.build_thread.is_alive()):
+            print(colored("Can't benchmark while background jobs or builds are running. Wait for them or cancel them first.", "red"))
+            return []
+
+        with open(file_path, 'r') as f:
+            english_text = f.read()
+
+        providers = providers or list(PROVIDER_NAMES)
+        original_provider = self.provider
+        results = []
+
+        try:
+            for provider in providers:
+                if provider not in PROVIDER_NAMES:
+                    print(colored(f"Unknown provider: {provider}", "red"))
+                    continue
+                if not self.provider_available(provider):
+                    print(colored(f"Skipping {PROVIDER_NAMES[provider]}: not configured.", "yellow"))
+                    continue
+
+                self.provider = provider
+                self.setup_api_config()
+                print(colored(f"\nBenchmarking {PROVIDER_NAMES[provider]} ({self.model_info[provider]})...", "cyan"))
+
+                # Load the local model up front so its load and prefix warm-up
+                # aren't counted as request latency
+                load_time = None
+                if provider == "local":
+                    start = time.perf_counter()
+                    try:
+                        self.load_local_model()
+                    except Exception as e:
+                        print(colored(f"Error loading local model: {e}", "red"))
+                        results.append((provider, None, [], None, False))
+                        continue
+                    load_time = time.perf_counter() - start
+
+                project_dir = tempfile.mkdtemp(prefix=f"ailbench-{provider}-")
+                subprocess.run(["go", "mod", "init", "ailbench"], cwd=project_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+                # Later runs show the effect of caching, such as the local model's
+                # shared-prefix KV cache
+                run_times = []
+                size = None
+                builds = False
+                try:
+                    for _ in range(max(self.config.get("benchmark_runs", 2), 1)):
+                        start = time.perf_counter()
+                        golang_file = self.convert_to_golang(english_text, project_dir)
+                        run_times.append(time.perf_counter() - start)
+                    size = os.path.getsize(golang_file)
+                    builds = self.quick_build(golang_file)[0]
+                except Exception:
+                    pass
+                finally:
+                    shutil.rmtree(project_dir, ignore_errors=True)
+                results.append((provider, load_time, run_times, size, builds))
+        finally:
+            self.provider = original_provider
+            self.setup_api_config()
+
+        print(colored("\nBenchmark results:", "cyan"))
+        for provider, load_time, run_times, size, builds in results:
+            load = f"load {load_time:5.1f}s" if load_time is not None else "load     -"
+            runs = "  ".join(f"{t:6.1f}s" for t in run_times)
+            if size is None:
+                print(colored(f"  {PROVIDER_NAMES[provider]:<14} {load}  runs: {runs}  FAILED", "red"))
+            else:
+                print(colored(f"  {PROVIDER_NAMES[provider]:<14} {load}  runs: {runs}  {size:6d} bytes  builds: {'yes' if builds else 'no'}",
+                              "green" if builds else "yellow"))
+        return results
+
     def process_file(self, file_path):
         if not file_path.endswith('.ail'):
             raise ValueError("Only .ail files are supported")
@@ -574,19 +1599,14 @@ done     - Exit interactive mode
             with open(file_path, 'r') as f:
                 english_text = f.read()
 
-            project_name = input("\nEnter the name for your project: ").strip()
+            project_name = self.ask("\nEnter the name for your project: ", "project_name").strip()
             project_dir = os.path.join(os.getcwd(), project_name)
+            self.claim_project_dir(project_dir)
             os.makedirs(project_dir, exist_ok=True)  # Create project directory
 
-            # Add project directory to config
-            if "project_dirs" not in self.config:
-                self.config["project_dirs"] = []
-            if project_dir not in self.config["project_dirs"]:
-                self.config["project_dirs"].append(project_dir)
-                self.save_config()
-
             print("\nConverting English to Golang...")
             golang_file = self.convert_to_golang(english_text, project_dir)
+            self.check_cancelled()
 
             # Create go.mod and install dependencies
             subprocess.run(["go", "mod", "init", project_name], cwd=project_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -602,20 +1622,27 @@ done     - Exit interactive mode
                 max_debug_attempts = 5
 
                 while not build_success and debug_attempts < max_debug_attempts:
+                    self.check_cancelled()
                     result = subprocess.run(["go", "build", golang_file], cwd=project_dir, capture_output=True, text=True)
 
                     if result.returncode != 0:
                         print(colored("Build failed!", "red"))
                         print(colored(result.stderr, "red"))
-                        self.explain_error(result.stderr) # Explain build error
 
-                        debug_choice = input("\nWould you like to debug and fix the errors? (y/n): ").strip().lower()
+                        # Only errors the local fixers can't handle need the AI
+                        error_message = self.fix_locally(golang_file, result.stderr)
+                        if not error_message:
+                            print(colored("\nAttempting to build with fixed code...", "yellow"))
+                            continue
+                        self.explain_error(error_message) # Explain build error
+
+                        debug_choice = self.ask("\nWould you like to debug and fix the errors? (y/n): ", "debug").strip().lower()
 
                         if debug_choice == 'y':
                             debug_attempts += 1
                             print(colored(f"Debug attempt {debug_attempts}/{max_debug_attempts}", "yellow"))
 
-                            debug_success = self.debug_golang_code(golang_file, result.stderr)
+                            debug_success = self.debug_golang_code(golang_file, error_message)
 
                             if not debug_success:
                                 print(colored("Failed to debug the code. Please try again.", "red"))
@@ -632,7 +1659,11 @@ done     - Exit interactive mode
                     exe_file = golang_file.removesuffix('.go')
                     print(colored(f"\nSuccess! Built your program at '{os.path.join(project_dir, exe_file)}'.", "green"))
 
-                    run_program = input("Do you want to run the program? (y/n): ").strip().lower()
+                    cross_choice = self.ask(f"Do you want to cross-compile for {', '.join(self.build_targets)}? (y/n): ", "cross_compile").strip().lower()
+                    if cross_choice == 'y':
+                        self.cross_compile(golang_file, project_dir)
+
+                    run_program = self.ask("Do you want to run the program? (y/n): ", "run").strip().lower()
                     if run_program == 'y':
                         subprocess.run([os.path.join(project_dir, exe_file)], cwd=project_dir)
                     else:
@@ -642,9 +1673,156 @@ done     - Exit interactive mode
                     print(colored("The code still has errors. You may need to manually fix the issues.", "red"))
                 else:
                     print(colored("\nBuild process was not successful.", "red"))
+                return build_success
+        except JobCancelled:
+            raise
         except Exception as e:
             print(colored(f"An unexpected error occurred: {e}", "red"))
             self.explain_error(str(e))
+        return False
+
+    def ask(self, prompt, key):
+        """Prompt the user, or answer with the job's default inside a background job."""
+        job = getattr(job_local, "job", None)
+        if job is None:
+            return input(prompt)
+
+        answer = job["answers"][key]
+        print(f"{prompt}{answer} (job default)")
+        return answer
+
+    def claim_project_dir(self, project_dir):
+        """Add a project directory to the config, refusing one a running job is using."""
+        job = getattr(job_local, "job", None)
+        with self.config_lock:
+            for other in self.jobs.values():
+                if other is not job and other["status"] == "running" and other["project_dir"] == project_dir:
+                    raise ValueError(f"Project directory {project_dir} is in use by job {other['id']}")
+            if job is not None:
+                job["project_dir"] = project_dir
+
+            if "project_dirs" not in self.config:
+                self.config["project_dirs"] = []
+            if project_dir not in self.config["project_dirs"]:
+                self.config["project_dirs"].append(project_dir)
+                self.save_config()
+
+    def check_cancelled(self):
+        """Stop the current background job if it has been cancelled."""
+        job = getattr(job_local, "job", None)
+        if job is not None and job["cancel"].is_set():
+            raise JobCancelled()
+
+    def start_job(self, file_path):
+        """Run 'make <file_path>' on the job worker pool."""
+        if not isinstance(sys.stdout, JobOutput):
+            sys.stdout = JobOutput(sys.stdout)
+        if self.job_executor is None:
+            self.job_executor = ThreadPoolExecutor(max_workers=self.config.get("max_jobs", 2))
+
+        answers = dict(DEFAULT_JOB_ANSWERS, **self.config.get("job_answers", {}))
+        # Suffix the job id so jobs for specs with the same name don't share a directory
+        answers["project_name"] = f"{Path(file_path).stem}-{self.next_job_id}"
+
+        job = {
+            "id": self.next_job_id,
+            "command": f"make {file_path}",
+            "status": "queued",
+            "log": [],
+            "cancel": threading.Event(),
+            "answers": answers,
+            "project_dir": None,
+            "started": None,
+            "finished": None
+        }
+        self.next_job_id += 1
+        self.jobs[job["id"]] = job
+        job["future"] = self.job_executor.submit(self.run_job, job, file_path)
+        print(colored(f"[{job['id']}] Started: {job['command']}", "cyan"))
+        return job
+
+    def run_job(self, job, file_path):
+        """Worker body for start_job."""
+        if job["cancel"].is_set():
+            job["status"] = "cancelled"
+            return
+
+        job["status"] = "running"
+        job["started"] = time.time()
+        job_local.job = job
+        try:
+            job["status"] = "done" if self.process_file(file_path) else "failed"
+        except JobCancelled:
+            job["status"] = "cancelled"
+            print(colored("Job cancelled.", "yellow"))
+        except Exception as e:
+            job["status"] = "failed"
+            print(colored(f"Error: {e}", "red"))
+        finally:
+            job_local.job = None
+            job["finished"] = time.time()
+
+        color = "green" if job["status"] == "done" else "red"
+        print(colored(f"\n[{job['id']}] {job['status'].capitalize()}: {job['command']} ({job['finished'] - job['started']:.1f}s)", color))
+
+    def get_job(self, job_id):
+        """Look up a job by the id typed at the REPL."""
+        job = self.jobs.get(int(job_id)) if job_id.isdigit() else None
+        if job is None:
+            print(colored(f"No such job: {job_id}", "red"))
+        return job
+
+    def list_jobs(self):
+        """Show all background jobs and their status."""
+        if not self.jobs:
+            print("No background jobs.")
+            return
+
+        for job in self.jobs.values():
+            if job["started"] is None:
+                elapsed = ""
+            else:
+                elapsed = f" ({(job['finished'] or time.time()) - job['started']:.1f}s)"
+            print(f"[{job['id']}] {job['status']:<10}{job['command']}{elapsed}")
+
+    def wait_job(self, job_id):
+        """Block until a job finishes, then show its log."""
+        job = self.get_job(job_id)
+        if job is None:
+            return
+
+        try:
+            job["future"].result()
+        except KeyboardInterrupt:
+            print(colored("\nStopped waiting. The job keeps running in the background.", "yellow"))
+            return
+        except Exception:
+            pass
+        self.show_job_log(job_id)
+
+    def cancel_job(self, job_id):
+        """Cancel a queued job, or stop a running one at its next step."""
+        job = self.get_job(job_id)
+        if job is None:
+            return
+
+        if job["status"] in ("done", "failed", "cancelled"):
+            print(f"Job {job_id} has already finished.")
+            return
+
+        job["cancel"].set()
+        if job["future"].cancel():
+            job["status"] = "cancelled"
+            print(colored(f"[{job_id}] Cancelled.", "yellow"))
+        else:
+            print(colored(f"[{job_id}] Cancelling after the current step...", "yellow"))
+
+    def show_job_log(self, job_id):
+        """Print everything a job has output so far."""
+        job = self.get_job(job_id)
+        if job is not None:
+            print(colored(f"--- [{job['id']}] {job['command']} ({job['status']}) ---", "cyan"))
+            print("".join(job["log"]))
 
 
     def clean_files(self):
@@ -669,8 +1847,9 @@ done     - Exit interactive mode
 
         print(colored(f"Deleted {deleted_dirs} project directories.", "green"))
 
-        self.config["project_dirs"] = []
-        self.save_config()
+        with self.config_lock:
+            self.config["project_dirs"] = []
+            self.save_config()
 
     def explain_error(self, error_message):
         """Explain the error using the AI."""
@@ -689,6 +1868,8 @@ done     - Exit interactive mode
         try:
             if self.provider == "hf":
                 response = self.send_to_hf(prompt)
+            elif self.provider == "local":
+                response = self.send_to_local(prompt)
             else:
                 response = self.send_to_or(prompt)
 
@@ -712,10 +1893,30 @@ def main():
             if command.lower() == 'exit':
                 break
 
+            elif command.lower().startswith('make ') and command.endswith('&'):
+                file_path = command[5:-1].strip()
+                if not file_path.endswith('.ail'):
+                    raise ValueError("Only .ail files are supported")
+                if not os.path.exists(file_path):
+                    raise FileNotFoundError(f"File not found: {file_path}")
+                interpreter.start_job(file_path)
+
             elif command.lower().startswith('make '):
                 file_path = command[5:].strip()
                 interpreter.process_file(file_path)
 
+            elif command.lower() == 'jobs':
+                interpreter.list_jobs()
+
+            elif command.lower().startswith('wait '):
+                interpreter.wait_job(command[5:].strip())
+
+            elif command.lower().startswith('cancel '):
+                interpreter.cancel_job(command[7:].strip())
+
+            elif command.lower().startswith('log '):
+                interpreter.show_job_log(command[4:].strip())
+
             elif command.lower() == 'interactive':
                 ail_file = input("Enter the location of the .ail file you want to base this interaction off of: ").strip()
                 interpreter.interactive_session(ail_file)
@@ -745,26 +1946,54 @@ def main():
             elif command.lower() == 'provider or':
                 interpreter.change_provider("or")
 
+            elif command.lower() == 'provider local':
+                interpreter.change_provider("local")
+
+            elif command.lower().startswith('benchmark '):
+                args = command[10:].split()
+                interpreter.benchmark_providers(args[0], [p.lower() for p in args[1:]])
+
+            elif command.lower() == 'targets':
+                print(f"Build targets: {', '.join(interpreter.build_targets)}")
+                print(f"Strip binaries: {'On' if interpreter.strip_binaries else 'Off'}")
+
+            elif command.lower().startswith('targets '):
+                interpreter.set_build_targets(command[8:].strip())
+
+            elif command.lower() in ['strip on', 'strip off']:
+                interpreter.set_strip_binaries(command.lower() == 'strip on')
+
             elif command.lower() == 'model':
                 interpreter.change_model()
 
             elif command.lower() == 'status':
-                provider_name = "HuggingFace" if interpreter.provider == "hf" else "OpenRouter"
+                provider_name = PROVIDER_NAMES[interpreter.provider]
                 model_name = interpreter.model_info[interpreter.provider]
                 print(f"Current provider: {provider_name}")
                 print(f"Current model: {model_name}")
                 print(f"HF API Key: {'Set' if interpreter.api_keys['hf'] else 'Not set'}")
                 print(f"OR API Key: {'Set' if interpreter.api_keys['or'] else 'Not set'}")
+                print(f"Build targets: {', '.join(interpreter.build_targets)}")
 
             elif command.lower() == 'help':
                 print("\nCommands:")
                 print("make <file.ail>  - Process a .ail file")
+                print("make <file.ail> & - Process a .ail file as a background job")
+                print("jobs             - List background jobs")
+                print("wait <id>        - Wait for a job to finish and show its output")
+                print("cancel <id>      - Cancel a background job")
+                print("log <id>         - Show the output of a job so far")
                 print("interactive      - Enter interactive mode")
                 print("clean            - Remove all generated .go and .exe files")
                 print("config hf <key>  - Set HuggingFace API key")
                 print("config or <key>  - Set OpenRouter API key")
                 print("provider hf      - Switch to HuggingFace provider")
                 print("provider or      - Switch to OpenRouter provider")
+                print("provider local   - Switch to a local model on CPU (needs llama-cpp-python)")
+                print("benchmark <file.ail> [hf or local] - Compare providers on the same .ail file")
+                print("targets          - Show cross-compilation targets")
+                print("targets <list>   - Set targets, e.g. targets linux/amd64,windows/amd64")
+                print("strip on|off     - Toggle -trimpath -ldflags='-s -w' for cross builds")
                 print("model            - Change the current model")
                 print("status           - Show current provider and model settings")
                 print("help             - Show this help message")